@@ -1,2 +1,3 @@
 from .spec import Spec
-from .distributions import BaseDistribution, FloatDist, CatDist
\ No newline at end of file
+from .distributions import BaseDistribution, FloatDist, CatDist
+from .grid import GridSpace
@@ -1,9 +1,34 @@
 import numpy as np
 import abc
-from typing import List, Any
+from typing import List, Any, Generator
 import warnings
 
 
+DEFAULT_CHUNK_SIZE = 100000
+
+# Relative slack, in units of step, when counting the steps between two bounds.
+STEP_TOLERANCE = 1e-9
+
+
+# Values already yielded by unique streaming are kept as a list of sorted
+# runs whose lengths roughly halve from first to last. A new run is merged
+# with the runs before it while they are no longer than it, so every value
+# is re-sorted O(log(n/chunk)) times and lookups search O(log(n/chunk)) runs.
+def _runs_contain(runs:List[np.ndarray], values:np.ndarray) -> np.ndarray:
+    found = np.zeros(len(values), dtype=bool)
+    for run in runs:
+        pos = np.minimum(np.searchsorted(run, values), len(run) - 1)
+        found |= run[pos] == values
+    return found
+
+
+def _runs_add(runs:List[np.ndarray], values:np.ndarray) -> None:
+    runs.append(np.sort(values))
+    while len(runs) > 1 and len(runs[-2]) <= len(runs[-1]):
+        last = runs.pop()
+        runs[-1] = np.sort(np.concatenate([runs[-1], last]), kind="stable")
+
+
 class BaseDistribution(abc.ABC):
     """
     Abstract base class for all parameter distributions. This defines
@@ -22,6 +47,15 @@ class BaseDistribution(abc.ABC):
     sample_unique:
         Draw n unique samples from the parameter space.
 
+    sample_array:
+        Draw n samples from the parameter space as a numpy array.
+
+    iter_samples:
+        Draw n samples from the parameter space in fixed-size numpy chunks.
+
+    grid_values:
+        Every value of a discrete parameter space, used for grid search.
+
     """
     def __init__(self, name:str) -> None:
         self.name = name
@@ -68,6 +102,106 @@ class BaseDistribution(abc.ABC):
         raise NotImplementedError
     
 
+    def sample_array(self, n:int) -> np.ndarray:
+        """
+        Draws n samples from the parameter space and returns them as
+        a numpy array. Subclasses should override this to avoid building
+        an intermediate list.
+
+        Parameters
+        ----------
+        n: int
+            The number of samples to draw.
+
+        Returns
+        -------
+        samples: np.ndarray
+            Array of n sampled values.
+        """
+        sample = self.sample(n)
+        # sample returns a single value rather than a list when n is 1.
+        if n == 1 and not isinstance(sample, (list, tuple, np.ndarray)):
+            sample = [sample]
+
+        array = np.empty(n, dtype=object)
+        array[:] = list(sample)
+        return array
+
+
+    def iter_samples(self, n:int, chunk:int=DEFAULT_CHUNK_SIZE,
+                     unique:bool=False) -> Generator[np.ndarray, None, None]:
+        """
+        Draws n samples from the parameter space and yields them in numpy arrays
+        of at most chunk values, so only one chunk is held in memory at a time.
+
+        Parameters
+        ----------
+        n: int
+            The total number of samples to draw.
+
+        chunk: int
+            Maximum number of samples in each yielded array.
+
+        unique: bool (default is False)
+            If True, no value is yielded twice across all chunks. The base
+            implementation keeps every value yielded so far in sorted arrays,
+            so for continuous values the de-duplication state grows with n.
+
+        Yields
+        ------
+        samples: np.ndarray
+            Array of at most chunk sampled values.
+        """
+        if chunk < 1:
+            raise ValueError(f"chunk must be a positive integer, got {chunk}.")
+
+        if not unique:
+            remaining = n
+            while remaining > 0:
+                size = min(chunk, remaining)
+                yield self.sample_array(size)
+                remaining -= size
+            return
+
+        seen = []
+        remaining = n
+        attempts = 0
+        max_attempts = getattr(self, 'max_attempts', 1000)
+
+        while (remaining > 0) and (attempts < max_attempts):
+            size = min(chunk, remaining)
+            s = np.unique(self.sample_array(size))
+            s = s[~_runs_contain(seen, s)]
+
+            if len(s) == 0:
+                attempts += 1
+                continue
+
+            s = np.random.permutation(s)[:remaining]
+            _runs_add(seen, s)
+            remaining -= len(s)
+            attempts = 0
+            yield s
+
+        if remaining > 0:
+            warnings.warn(f"{self.name}: failed to find {n} unique samples. "
+                          f"Only found {n - remaining}.")
+    
+
+    def grid_values(self) -> np.ndarray:
+        """
+        Returns every value in the parameter space for grid search. Only
+        discrete distributions can be searched over, so the base
+        implementation raises ValueError, as FloatDist does without a step.
+
+        Returns
+        -------
+        values: np.ndarray
+            Array of every value the parameter can take.
+        """
+        raise ValueError(f"{self.name}: {self.__class__.__name__} does not support grid search.")
+    
+
 class FloatDist(BaseDistribution):
     """
     Distribution class for parameters of type float.
@@ -105,6 +239,18 @@ class FloatDist(BaseDistribution):
         Returns unique sampled values from a uniform or log-uniform distribution
         between min_val and max_val. If step is specified, all sampled values are
         separated by at least step.
+
+    sample_array
+        Same as sample but returns a numpy array instead of a list.
+
+    iter_samples
+        Yields samples in fixed-size numpy arrays. With unique=True and step
+        specified, values already yielded are tracked as one bit per step, or
+        as sorted step indices when n is small next to the number of steps.
+
+    grid_values
+        Returns every multiple of step from min_val up to max_val. Only
+        available if step is specified.
         
     """
 
@@ -125,6 +271,60 @@ class FloatDist(BaseDistribution):
     def _max_unique_sample_size(self) -> int:
         if self.step:
             return ((self.max_val - self.min_val)//self.step)*self.step + 1
+        
+
+    def _n_steps(self) -> int:
+        # Number of grid points from min_val up to and including max_val. The
+        # tolerance stops float error dropping an endpoint, e.g. 0.3/0.1 < 3.
+        return int(np.floor((self.max_val - self.min_val)/self.step + STEP_TOLERANCE)) + 1
+    
+
+    def _n_sample_steps(self) -> int:
+        # Number of grid points self.sample can return. Uniform draws never
+        # reach max_val, so it is excluded when it lies on the grid.
+        return max(int(np.ceil((self.max_val - self.min_val)/self.step - STEP_TOLERANCE)), 1)
+
+
+    def grid_values(self) -> np.ndarray:
+        """
+        Returns every multiple of self.step added to self.min_val up to and including
+        self.max_val. If self.max_val lies on the grid it is included here even though
+        self.sample never returns it, as uniform draws exclude the upper bound.
+
+        Returns
+        -------
+        values: np.ndarray
+            Array of floats in ascending order.
+        """
+        if not self.step:
+            raise ValueError(f"{self.name}: grid search requires step to be specified.")
+        
+        return np.arange(self._n_steps(), dtype=np.float64) * self.step + self.min_val
+
+
+    def sample_array(self, n:int) -> np.ndarray:
+        """
+        Same as self.sample but returns a numpy array of floats instead of a list.
+
+        Parameters
+        ----------
+        n: int
+            number of samples to draw.
+
+        Returns
+        -------
+        sample: np.ndarray
+            The sampled parameter values.
+        """
+        if self.log:
+            sample = np.exp(np.random.uniform(np.log(self.min_val), np.log(self.max_val), n))
+        else:
+            sample = np.random.uniform(self.min_val, self.max_val, n)
+
+        if self.step:
+            sample = ((sample - self.min_val) // self.step) * self.step + self.min_val
+
+        return sample
 
     def sample(self, n:int) -> List[float]:
         """
@@ -146,15 +346,7 @@ class FloatDist(BaseDistribution):
             If self.step is True, all sampled values are rounded to the nearest multiple
             of self.step greater than or equal to self.min_val. 
         """
-        if self.log:
-            sample = np.exp(np.random.uniform(np.log(self.min_val), np.log(self.max_val), n))
-        else:
-            sample = np.random.uniform(self.min_val, self.max_val, n)
-
-        if self.step:
-            sample = ((sample - self.min_val) // self.step) * self.step + self.min_val
-        
-        return list(sample)
+        return list(self.sample_array(n))
     
 
     def sample_unique(self, n:int) -> List[float]:
@@ -197,6 +389,84 @@ class FloatDist(BaseDistribution):
         return list(sample)
     
 
+    def iter_samples(self, n:int, chunk:int=DEFAULT_CHUNK_SIZE,
+                     unique:bool=False) -> Generator[np.ndarray, None, None]:
+        """
+        Draws n samples and yields them in numpy arrays of at most chunk values.
+        If unique is True and self.step is set, the values already yielded are
+        tracked as one bit per step between self.min_val and self.max_val, or as
+        sorted step indices (8 bytes each) when that takes less memory, i.e. when
+        there are more than 64 steps per requested sample. If there are fewer
+        steps than n, as many unique values as possible are yielded with a
+        warning message.
+
+        Parameters
+        ----------
+        n: int
+            The total number of samples to draw.
+
+        chunk: int
+            Maximum number of samples in each yielded array.
+
+        unique: bool (default is False)
+            If True, no value is yielded twice across all chunks.
+
+        Yields
+        ------
+        samples: np.ndarray
+            Array of at most chunk sampled values.
+        """
+        if not (unique and self.step):
+            yield from super().iter_samples(n, chunk=chunk, unique=unique)
+            return
+
+        if chunk < 1:
+            raise ValueError(f"chunk must be a positive integer, got {chunk}.")
+
+        n_steps = self._n_sample_steps()
+        if n_steps < n:
+            warnings.warn(f"{self.name}: {n} unique samples are impossible with step={self.step}. "
+                          f"{n_steps} is the maximum possible number of unique samples.")
+            n = n_steps
+
+        # A bitset costs n_steps/8 bytes and sorted indices cost 8 bytes per sample.
+        dense = n_steps <= 64 * n
+        if dense:
+            bits = np.zeros((n_steps + 7) // 8, dtype=np.uint8)
+        else:
+            runs = []
+
+        remaining = n
+        attempts = 0
+
+        while (remaining > 0) and (attempts < self.max_attempts):
+            size = min(chunk, remaining)
+            idx = np.rint((self.sample_array(size) - self.min_val) / self.step).astype(np.int64)
+            idx = np.unique(np.clip(idx, 0, n_steps - 1))
+
+            if dense:
+                idx = idx[((bits[idx >> 3] >> (idx & 7)) & 1) == 0]
+            else:
+                idx = idx[~_runs_contain(runs, idx)]
+
+            if len(idx) == 0:
+                attempts += 1
+                continue
+
+            idx = np.random.permutation(idx)[:remaining]
+            if dense:
+                np.bitwise_or.at(bits, idx >> 3, (1 << (idx & 7)).astype(np.uint8))
+            else:
+                _runs_add(runs, idx)
+            remaining -= len(idx)
+            attempts = 0
+            yield idx.astype(np.float64) * self.step + self.min_val
+
+        if remaining > 0:
+            warnings.warn(f"Failed to find maximum possible unique samples. "
+                          f"Maximum is {n} but only found {n - remaining}")
+    
+
 class CatDist(BaseDistribution):
     """
     Distribution class for categorical parameters.
@@ -220,6 +490,18 @@ class CatDist(BaseDistribution):
         Returns a list of unique samples from self.options. If requested number (n)
         is greater than len(self.options) the maximum unique samples are returned 
         which is simply self.options.
+
+    sample_array:
+        Returns a numpy array of n items drawn uniformly from self.options. Unlike
+        sample, every option is not guaranteed to appear.
+
+    iter_samples:
+        Yields items drawn uniformly from self.options in fixed-size numpy arrays.
+        With unique=True, options are taken in order from a single permutation
+        so none is yielded twice.
+
+    grid_values:
+        Returns self.options as a numpy array.
     """
 
     def __init__(self, name:str, options:List[Any]) -> None:
@@ -227,6 +509,34 @@ class CatDist(BaseDistribution):
         self.options = options
 
 
+    def _options_array(self) -> np.ndarray:
+        # Options of one scalar type get a native dtype so that sampled columns
+        # and comparisons on them run at numpy speed. Anything else is filled
+        # element-wise into an object array so mixed types are kept as they are,
+        # e.g. np.asarray(['a', 1]) would turn 1 into '1'.
+        types = {type(option) for option in self.options}
+        if len(types) == 1 and issubclass(types.pop(), (bool, int, float, str, np.generic)):
+            options = np.asarray(self.options)
+            if options.ndim == 1 and options.dtype != object:
+                return options
+
+        options = np.empty(len(self.options), dtype=object)
+        options[:] = list(self.options)
+        return options
+
+
+    def grid_values(self) -> np.ndarray:
+        """
+        Returns self.options for grid search.
+
+        Returns
+        -------
+        values: np.ndarray
+            Array of self.options in their original order.
+        """
+        return self._options_array()
+
+
     def sample(self, n = 1) -> List[Any]:
         """
         Samples self.options.
@@ -276,4 +586,65 @@ class CatDist(BaseDistribution):
             return self.options
         
         else:
-            return np.random.choice(self.options, n, replace=False)
\ No newline at end of file
+            return np.random.choice(self.options, n, replace=False)
+        
+
+    def sample_array(self, n:int) -> np.ndarray:
+        """
+        Draws n items uniformly from self.options.
+
+        Parameters
+        ----------
+        n: int
+            Number of samples to draw.
+
+        Returns
+        -------
+        sample: np.ndarray
+            Array of n samples from self.options. The dtype is native if all
+            options are scalars of the same type and object otherwise.
+        """
+        return self._options_array()[np.random.randint(0, len(self.options), n)]
+
+
+    def iter_samples(self, n:int, chunk:int=DEFAULT_CHUNK_SIZE,
+                     unique:bool=False) -> Generator[np.ndarray, None, None]:
+        """
+        Draws n items from self.options and yields them in numpy arrays of at
+        most chunk values. If unique is True, no option is yielded twice and at
+        most len(self.options) values are yielded in total.
+
+        Parameters
+        ----------
+        n: int
+            The total number of samples to draw.
+
+        chunk: int
+            Maximum number of samples in each yielded array.
+
+        unique: bool (default is False)
+            If True, no option is yielded twice across all chunks.
+
+        Yields
+        ------
+        samples: np.ndarray
+            Array of at most chunk samples from self.options.
+        """
+        if not unique:
+            yield from super().iter_samples(n, chunk=chunk)
+            return
+
+        if chunk < 1:
+            raise ValueError(f"chunk must be a positive integer, got {chunk}.")
+
+        if n > len(self.options):
+            warnings.warn(f"{self.name}: {n} unique samples are impossible with only {len(self.options)} options. "
+                          f"Returned {len(self.options)} unique samples (all options).")
+            n = len(self.options)
+
+        # A permutation of option indices never repeats, so the position in it
+        # is all the state needed across chunks.
+        options = self._options_array()
+        order = np.random.permutation(len(self.options))[:n]
+        for start in range(0, n, chunk):
+            yield options[order[start:start + chunk]]
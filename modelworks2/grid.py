@@ -0,0 +1,210 @@
+import math
+import numpy as np
+from typing import Dict, List, Any, Tuple, Generator, Optional
+
+from .distributions import BaseDistribution, FloatDist, DEFAULT_CHUNK_SIZE
+
+
+# Largest distance, as a fraction of step, between a float value and its
+# grid point for the value to count as on the grid.
+GRID_TOLERANCE = 1e-6
+
+
+class GridSpace:
+    """
+    Lazy grid over the Cartesian product of discrete parameter distributions.
+    Every config has an integer index, read as a mixed-radix number with one
+    digit per parameter (the last parameter varies fastest). Configs are only
+    built when asked for, so the grid is never materialised.
+
+    Attributes
+    ----------
+    names: list[str]
+        Names of the parameters in the grid.
+
+    values: list[np.ndarray]
+        The grid values of each parameter, from BaseDistribution.grid_values.
+
+    radices: np.ndarray
+        Number of grid values of each parameter.
+
+    strides: np.ndarray
+        Index distance between consecutive values of each parameter.
+
+    size: int
+        Total number of configs in the grid.
+
+    Methods
+    -------
+    config:
+        Returns the config at an index.
+
+    index:
+        Returns the index of a config.
+
+    shard:
+        Splits the index range into contiguous, near equal parts for parallel workers.
+
+    iter_configs:
+        Yields configs in an index range as chunks of numpy columns, skipping
+        indices of configs that are already done.
+    """
+
+    def __init__(self, params:List[BaseDistribution], trials:Optional[List[Dict]]=None) -> None:
+        if not params:
+            raise ValueError("No params provided. A grid needs at least one parameter.")
+        
+        self._params = params
+        self.names = [dist.name for dist in params]
+        self.values = [dist.grid_values() for dist in params]
+        self.radices = np.array([len(v) for v in self.values], dtype=np.int64)
+
+        size = math.prod(len(v) for v in self.values)
+        if size > np.iinfo(np.int64).max:
+            raise ValueError(f"Grid of {size} configs is too large to index.")
+        
+        self.size = size
+        self.strides = np.ones(len(params), dtype=np.int64)
+        for i in range(len(params) - 2, -1, -1):
+            self.strides[i] = self.strides[i + 1] * self.radices[i + 1]
+
+        self._done = self._done_indices(trials or [])
+
+
+    def __len__(self) -> int:
+        return self.size
+
+
+    def _digit(self, i:int, value:Any) -> int:
+        dist = self._params[i]
+        if isinstance(dist, FloatDist):
+            digit = int(np.rint((value - dist.min_val) / dist.step))
+            if not (0 <= digit < self.radices[i] and abs(value - self.values[i][digit]) <= GRID_TOLERANCE * dist.step):
+                raise ValueError(f"{value} is not on the grid of {dist.name}.")
+            return digit
+        
+        else:
+            for digit, option in enumerate(self.values[i]):
+                if option == value:
+                    return digit
+            raise ValueError(f"{value} is not on the grid of {dist.name}.")
+        
+
+    def _done_indices(self, trials:List[Dict]) -> np.ndarray:
+        done = []
+        for trial in trials:
+            try:
+                done.append(self.index(trial))
+            except (KeyError, ValueError, TypeError):
+                # Trials from other searches may not lie on this grid.
+                continue
+        return np.unique(np.array(done, dtype=np.int64))
+    
+
+    def config(self, index:int) -> Dict[str, Any]:
+        """
+        Returns the config at index in O(number of parameters).
+
+        Parameters
+        ----------
+        index: int
+            Index of the config, 0 <= index < self.size.
+
+        Returns
+        -------
+        config: dict[str, Any]
+            Mapping of parameter name to value.
+        """
+        if not 0 <= index < self.size:
+            raise IndexError(f"Index {index} out of range for grid of size {self.size}.")
+        
+        return {name:values[(index // stride) % radix]
+                for name, values, stride, radix in zip(self.names, self.values, self.strides, self.radices)}
+    
+
+    def index(self, config:Dict[str, Any]) -> int:
+        """
+        Returns the index of config. Raises ValueError if config is not on the grid
+        and KeyError if a parameter is missing.
+
+        Parameters
+        ----------
+        config: dict[str, Any]
+            Mapping of parameter name to value. Extra keys such as metrics are ignored.
+
+        Returns
+        -------
+        index: int
+            Index of config in the grid.
+        """
+        return sum(self._digit(i, config[name]) * int(self.strides[i]) for i, name in enumerate(self.names))
+    
+
+    def shard(self, worker:int, n_workers:int) -> Tuple[int, int]:
+        """
+        Splits the grid into n_workers contiguous index ranges of near equal size.
+
+        Parameters
+        ----------
+        worker: int
+            Which range to return, 0 <= worker < n_workers.
+
+        n_workers: int
+            Number of ranges to split the grid into.
+
+        Returns
+        -------
+        start, stop: tuple[int, int]
+            Index range of the shard, to be passed to self.iter_configs.
+        """
+        if not 0 <= worker < n_workers:
+            raise ValueError(f"worker must be between 0 and {n_workers - 1}, got {worker}.")
+        
+        return self.size * worker // n_workers, self.size * (worker + 1) // n_workers
+    
+
+    def iter_configs(self, start:int=0, stop:Optional[int]=None, chunk:int=DEFAULT_CHUNK_SIZE,
+                     skip_done:bool=True) -> Generator[Dict[str, np.ndarray], None, None]:
+        """
+        Yields the configs with indices in [start, stop) as dicts of numpy columns,
+        one column per parameter and at most chunk rows each.
+
+        Parameters
+        ----------
+        start: int
+            First index to yield, 0 <= start <= stop.
+
+        stop: int (default is None)
+            End of the index range, stop <= self.size. If None, iterates to the
+            end of the grid.
+
+        chunk: int
+            Maximum number of configs in each yielded dict.
+
+        skip_done: bool (default is True)
+            If True, configs in the trials passed at construction are not yielded.
+
+        Yields
+        ------
+        configs: dict[str, np.ndarray]
+            Mapping of parameter name to a column of values.
+        """
+        if chunk < 1:
+            raise ValueError(f"chunk must be a positive integer, got {chunk}.")
+        
+        stop = self.size if stop is None else stop
+        if not 0 <= start <= stop <= self.size:
+            raise IndexError(f"Index range [{start}, {stop}) out of range for grid of size {self.size}.")
+
+        for chunk_start in range(start, stop, chunk):
+            idx = np.arange(chunk_start, min(chunk_start + chunk, stop), dtype=np.int64)
+
+            if skip_done and len(self._done):
+                pos = np.clip(np.searchsorted(self._done, idx), 0, len(self._done) - 1)
+                idx = idx[self._done[pos] != idx]
+
+            if len(idx) == 0:
+                continue
+
+            yield {name:values[(idx // stride) % radix]
+                   for name, values, stride, radix in zip(self.names, self.values, self.strides, self.radices)}
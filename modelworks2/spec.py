@@ -2,9 +2,16 @@ from dataclasses import dataclass
 from typing import Dict, Callable, Union, Any, Optional, Tuple, Generator, List
 import os
 import json
+import math
+import threading
+import warnings
+from collections import deque
 from inspect import isclass
 
-from .distributions import BaseDistribution
+import numpy as np
+
+from .distributions import BaseDistribution, DEFAULT_CHUNK_SIZE
+from .grid import GridSpace
 from .utils import (_is_file,
                    _is_dir,
                    _parent_dir_exists,
@@ -12,11 +19,17 @@ from .utils import (_is_file,
                    _write_csv,
                    _append_csv,
                    _read_csv,
+                   _open,
                    _json_to_spec,
                    _spec_to_json_dict,
                    _callables_mapping)
 
 
+TRIAL_BATCH_SIZE = 64
+
+MAX_SAMPLE_BATCH = 1000000
+
+
 @dataclass
 class Spec:
     spec_name: Optional[str] = None
@@ -30,14 +43,161 @@ class Spec:
 
 
     def __post_init__(self) -> None:
+        self._init_trial_buffers()
         self.trials = []
+
+
+    def _init_trial_buffers(self) -> None:
+        self._trials_lock = threading.Lock()
+        self._local = threading.local()
+        self._buffers = []
+
+
+    def __getstate__(self) -> Dict:
+        # Locks and thread-locals can't be pickled or deep-copied. Pending
+        # buffered trials are merged in first so none are lost.
+        state = self.__dict__.copy()
+        state['_trials'] = self._trials_snapshot()
+        for attr in ('_trials_lock', '_local', '_buffers'):
+            del state[attr]
+        return state
+    
+
+    def __setstate__(self, state:Dict) -> None:
+        self.__dict__.update(state)
+        self._init_trial_buffers()
+
+
+    @property
+    def trials(self) -> List[Dict]:
+        self._flush_trials()
+        return self._trials
+    
+
+    @trials.setter
+    def trials(self, trials) -> None:
+        with self._trials_lock:
+            self._drain_buffers()
+            self._trials = trials
+
+
+    def _drain_buffers(self) -> None:
+        # Caller must hold self._trials_lock. deque.popleft is atomic so
+        # producers can keep appending to their buffers while this runs.
+        # A dead thread can't append again, so its buffer is dropped once drained.
+        alive = []
+        for thread, buffer in self._buffers:
+            is_alive = thread.is_alive()
+            while buffer:
+                self._trials.append(buffer.popleft())
+            if is_alive:
+                alive.append((thread, buffer))
+        self._buffers = alive
+
+
+    def _flush_trials(self) -> None:
+        with self._trials_lock:
+            self._drain_buffers()
+
+
+    def _extend_trials(self, trials) -> None:
+        with self._trials_lock:
+            self._drain_buffers()
+            self._trials.extend(trials)
+
+
+    def _replace_trials(self, trials) -> None:
+        # Pending trials are drained and discarded in the same lock
+        # acquisition as the replace, so none land in between.
+        with self._trials_lock:
+            self._drain_buffers()
+            self._trials = list(trials)
+
+
+    def _trials_snapshot(self) -> List[Dict]:
+        with self._trials_lock:
+            self._drain_buffers()
+            return list(self._trials)
         
 
     def add_trial(self, trial) -> None:
-        self.trials.append(trial)
+        # Each thread appends to its own buffer and only takes the shared
+        # lock to merge a full batch into self.trials.
+        buffer = getattr(self._local, 'buffer', None)
+        if buffer is None:
+            buffer = deque()
+            self._local.buffer = buffer
+            with self._trials_lock:
+                self._buffers.append((threading.current_thread(), buffer))
+
+        buffer.append(trial)
+
+        if len(buffer) >= TRIAL_BATCH_SIZE:
+            self._flush_trials()
+
+
+    def iter_samples(self, n, chunk=DEFAULT_CHUNK_SIZE) -> Generator[Dict[str, np.ndarray], None, None]:
+        if not self.params:
+            raise ValueError("Spec has no params to sample from.")
+        
+        elif chunk < 1:
+            raise ValueError(f"chunk must be a positive integer, got {chunk}.")
+
+        remaining = n
+        while remaining > 0:
+            size = min(chunk, remaining)
+            yield {dist.name:dist.sample_array(size) for dist in self.params}
+            remaining -= size
+
+
+    def sample(self, n, constraints:Optional[List[Callable]]=None,
+               max_attempts=1000) -> Dict[str, np.ndarray]:
+        if not self.params:
+            raise ValueError("Spec has no params to sample from.")
+        
+        constraints = constraints or []
+        accepted = []
+        n_accepted = 0
+        n_drawn = 0
+        batch = min(max(n, 1), MAX_SAMPLE_BATCH)
+        attempts = 0
+
+        while (n_accepted < n) and (attempts < max_attempts):
+            columns = {dist.name:dist.sample_array(batch) for dist in self.params}
+            mask = np.ones(batch, dtype=bool)
+            for constraint in constraints:
+                mask &= np.asarray(constraint(columns), dtype=bool)
+
+            accepted.append({name:col[mask] for name, col in columns.items()})
+            n_accepted += int(mask.sum())
+            n_drawn += batch
+            attempts += 1
+
+            # Oversample the remainder by the observed acceptance rate, with
+            # some headroom so one more batch is usually enough.
+            remaining = n - n_accepted
+            if n_accepted:
+                batch = math.ceil(1.2 * remaining * n_drawn / n_accepted)
+            else:
+                batch = 2 * batch
+            batch = min(max(batch, 1), MAX_SAMPLE_BATCH)
+
+        if n_accepted < n:
+            warnings.warn(f"Only found {n_accepted} of {n} samples satisfying the constraints "
+                          f"after {n_drawn} draws.")
+
+        return {dist.name:np.concatenate([a[dist.name] for a in accepted] or [dist.sample_array(0)])[:n]
+                for dist in self.params}
+
+
+    def grid(self, skip_trials=True) -> GridSpace:
+        if not self.params:
+            raise ValueError("Spec has no params to build a grid from.")
+        
+        return GridSpace(self.params, self._trials_snapshot() if skip_trials else None)
 
     
-    def trials_to_csv(self, path, overwrite=False, append=False) -> None:
+    def trials_to_csv(self, path, overwrite=False, append=False, compression=None) -> None:
         if not path:
             raise ValueError("Path not provided. You must provide a path to write to.")
         
@@ -51,10 +211,10 @@ class Spec:
             raise ValueError("Path should end in the filename to write to.")
         
         elif not _is_file(path) or overwrite:
-            _write_csv(path, self.trials)
+            _write_csv(path, self._trials_snapshot(), compression)
         
         elif append:
-            _append_csv(path, self.trials)
+            _append_csv(path, self._trials_snapshot(), compression)
         
         else:
             print(f"""Trials not saved. {path} already exists. Either:
@@ -63,7 +223,7 @@ class Spec:
                   3. Provide a different file. """)
             
     
-    def trials_from_csv(self, path, replace=False) -> None:
+    def trials_from_csv(self, path, replace=False, compression=None) -> None:
         if not path:
             raise ValueError("Path not provided. You must provide a path to read from.")
         
@@ -71,11 +231,10 @@ class Spec:
             raise ValueError(f"{path} is not a file.")
         
         elif replace:
-            self.trials = []
-            self.trials.extend(_read_csv(path))
+            self._replace_trials(_read_csv(path, compression))
 
         else:
-            self.trials.extend(_read_csv(path))
+            self._extend_trials(_read_csv(path, compression))
 
 
     def to_dict(self) -> Dict:
@@ -87,7 +246,7 @@ class Spec:
                 'fit_params':self.fit_params,
                 'pred_params':self.pred_params,
                 'preprocessing':self.preprocessing,
-                'trials':self.trials}
+                'trials':self._trials_snapshot()}
     
 
     def __iter__(self) -> Generator[Tuple[str, Any], None, None]:
@@ -95,7 +254,7 @@ class Spec:
             yield attr, val
 
 # TODO make save_spec work with Dists
-    def save_spec(self, path, overwrite=False) -> None:
+    def save_spec(self, path, overwrite=False, compression=None) -> None:
         if not path:
             raise ValueError("Path not provided. You must provide a path to write to.")
         
@@ -114,27 +273,27 @@ class Spec:
             for attr, val in self:
                 spec_dict[attr] = _spec_to_json_dict(val)
 
-            with open(path, 'w') as file:
+            with _open(path, 'w', compression) as file:
                 json.dump(spec_dict, file)
 
 
-    def load_spec(self, path, callables:List[Callable]) -> None:
+    def load_spec(self, path, callables:List[Callable], compression=None) -> None:
         mapping = _callables_mapping(callables)
-        with open(path, "r") as file:
+        with _open(path, "r", compression) as file:
             spec_data = json.load(file)
             for attr, _ in self:
                 setattr(self, attr, _json_to_spec(spec_data[attr], mapping))
 
 
-    def trials_from_spec(self, path, replace=False) -> None:
+    def trials_from_spec(self, path, replace=False, compression=None) -> None:
         if not path:
             raise ValueError("Path not provided.You must provide the path to the saved Spec.")
         
-        with open(path, "r") as file:
+        with _open(path, "r", compression) as file:
             spec_data = json.load(file)
 
             if replace:
-                self.trials = spec_data['trials']
+                self._replace_trials(spec_data['trials'])
 
             else:
-                self.trials.extend(spec_data['trials'])
\ No newline at end of file
+                self._extend_trials(spec_data['trials'])
\ No newline at end of file
@@ -1,11 +1,19 @@
 import os 
 import csv
+import gzip
+import bz2
+import lzma
 from inspect import isclass
 from typing import Dict, List, Any, Tuple, Callable
 
 from .distributions import BaseDistribution
 
 
+_COMPRESSION_OPENERS = {'gzip':gzip.open, 'bz2':bz2.open, 'lzma':lzma.open}
+
+_COMPRESSION_EXTENSIONS = {'.gz':'gzip', '.gzip':'gzip', '.bz2':'bz2', '.xz':'lzma', '.lzma':'lzma'}
+
+
 def _is_file(p) -> bool:
     return os.path.isfile(p)
 
@@ -28,15 +36,38 @@ def _ends_in_file(p) -> bool:
     return result
 
 
-def _write_csv(p, trials) -> None:
-    with open(p, "w", newline="") as file:
+def _infer_compression(p, compression=None) -> str|None:
+    if compression is None:
+        return _COMPRESSION_EXTENSIONS.get(os.path.splitext(p)[1].lower())
+    
+    elif compression not in _COMPRESSION_OPENERS:
+        raise ValueError(f"Unsupported compression '{compression}'. "
+                         f"Must be one of {list(_COMPRESSION_OPENERS)} or None.")
+    
+    else:
+        return compression
+
+
+def _open(p, mode, compression=None, newline=None):
+    # Text mode in every case. Appending to a compressed file adds a new
+    # stream/member, which all three stdlib readers read back transparently.
+    compression = _infer_compression(p, compression)
+    if compression is None:
+        return open(p, mode, newline=newline)
+    
+    else:
+        return _COMPRESSION_OPENERS[compression](p, mode + "t", newline=newline)
+
+
+def _write_csv(p, trials, compression=None) -> None:
+    with _open(p, "w", compression, newline="") as file:
         writer = csv.DictWriter(file, fieldnames=list(trials[0].keys()))
         writer.writeheader()
         writer.writerows(trials)
 
 
-def _append_csv(p, trials) -> None:
-    with open(p, "a", newline="") as file:
+def _append_csv(p, trials, compression=None) -> None:
+    with _open(p, "a", compression, newline="") as file:
         writer = csv.DictWriter(file, fieldnames=list(trials[0].keys()))
         writer.writerows(trials)
 
@@ -60,8 +91,8 @@ def _restore_dtype_csv(row) -> Dict:
     return restored_row
 
 
-def _read_csv(p) -> List[Dict]:
-    with open(p, "r", newline="") as file:
+def _read_csv(p, compression=None) -> List[Dict]:
+    with _open(p, "r", compression, newline="") as file:
         reader = csv.DictReader(file)
         rows = [_restore_dtype_csv(row) for row in reader]
         return rows
@@ -4,12 +4,16 @@ import os
 import sys
 import csv
 import json
+import pickle
+import copy
+import threading
+import numpy as np
 
 parent = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(parent)
 
 from modelworks2.spec import Spec
-from modelworks2.distributions import BaseDistribution, FloatDist
+from modelworks2.distributions import BaseDistribution, FloatDist, CatDist
 
 
 test_input_csv = os.path.join(parent, 'tests/test-input.csv')
@@ -218,4 +222,168 @@ def test_trials_from_spec(test_spec_fixture):
     test_spec.trials_from_spec(test_spec_fixture, replace=True)
 
     assert test_spec.trials == [{'param1':1, 'param2':0.01, 'param3':'p1', 'm1':0.1, 'm2':0.2},
-                                             {'param1':2, 'param2':0.02, 'param3':'p2', 'm1':0.2, 'm2':0.3}]
\ No newline at end of file
+                                             {'param1':2, 'param2':0.02, 'param3':'p2', 'm1':0.2, 'm2':0.3}]
+
+
+def test_iter_samples():
+    test_spec = Spec('test_spec', _mock_fit_pred, _mock_fit_pred,
+                     params=[FloatDist('param1', 0.0, 1.0),
+                             CatDist('param2', ['a', 'b', 'c'])])
+
+    chunks = list(test_spec.iter_samples(25, chunk=10))
+
+    assert [len(c['param1']) for c in chunks] == [10, 10, 5]
+    assert [len(c['param2']) for c in chunks] == [10, 10, 5]
+    assert all(0.0 <= v <= 1.0 for c in chunks for v in c['param1'])
+    assert all(v in ['a', 'b', 'c'] for c in chunks for v in c['param2'])
+
+
+def test_add_trial_threads():
+    test_spec = Spec('test_spec', _mock_fit_pred, _mock_fit_pred)
+    n_threads = 8
+    n_trials = 1000
+
+    def producer(thread_id):
+        for i in range(n_trials):
+            test_spec.add_trial({'thread':thread_id, 'i':i})
+
+    threads = [threading.Thread(target=producer, args=(t,)) for t in range(n_threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(test_spec.trials) == n_threads * n_trials
+    assert len(test_spec.to_dict()['trials']) == n_threads * n_trials
+    for t in range(n_threads):
+        assert [trial['i'] for trial in test_spec.trials if trial['thread'] == t] == list(range(n_trials))
+
+
+@pytest.mark.parametrize("extension", [".gz", ".bz2", ".xz"])
+def test_trials_to_csv_compressed(tmp_path, extension):
+    path = str(tmp_path / f"trials.csv{extension}")
+    test_spec = Spec('test_spec', _mock_fit_pred, _mock_fit_pred)
+    test_spec.add_trial({'param1_str':'str_p1', 'param2_int':1, 'param3_flt':0.1 ,'metric_1':0.01, 'metric_2':0.001})
+
+    test_spec.trials_to_csv(path)
+    test_spec.trials_to_csv(path, append=True)
+    test_spec.trials_from_csv(path, replace=True)
+
+    assert test_spec.trials == [{'param1_str':'str_p1', 'param2_int':1, 'param3_flt':0.1 ,'metric_1':0.01, 'metric_2':0.001},
+                                {'param1_str':'str_p1', 'param2_int':1, 'param3_flt':0.1 ,'metric_1':0.01, 'metric_2':0.001}]
+    
+
+def test_save_and_load_spec_compressed(tmp_path):
+    path = str(tmp_path / "spec.json")
+    test_spec = Spec('test_spec', _mock_fit_pred, _mock_fit_pred, {'m1':_mock_metric},
+                     [FloatDist('param1', 0.0, 1.0)])
+    test_spec.add_trial({'param1':0.1, 'm1':0.1})
+
+    test_spec.save_spec(path, compression='gzip')
+
+    with open(path, 'rb') as file:
+        assert file.read(2) == b'\x1f\x8b'
+
+    loaded_spec = Spec()
+    loaded_spec.load_spec(path, [FloatDist, _mock_fit_pred, _mock_metric], compression='gzip')
+    assert loaded_spec.trials == [{'param1':0.1, 'm1':0.1}]
+
+    loaded_spec.trials_from_spec(path, compression='gzip')
+    assert loaded_spec.trials == [{'param1':0.1, 'm1':0.1}, {'param1':0.1, 'm1':0.1}]
+
+
+def test_sample_constrained():
+    test_spec = Spec('test_spec', _mock_fit_pred, _mock_fit_pred,
+                     params=[FloatDist('max_depth', 1.0, 20.0, step=1.0),
+                             FloatDist('n_estimators', 10.0, 1000.0, step=10.0),
+                             CatDist('kernel', ['linear', 'rbf'])])
+    
+    constraints = [lambda c: c['max_depth'] * c['n_estimators'] < 500,
+                   lambda c: (c['kernel'] != 'rbf') | (c['max_depth'] > 2)]
+
+    sample = test_spec.sample(1000, constraints=constraints)
+
+    assert all(len(col) == 1000 for col in sample.values())
+    assert np.all(sample['max_depth'] * sample['n_estimators'] < 500)
+    assert np.all((sample['kernel'] != 'rbf') | (sample['max_depth'] > 2))
+
+
+def test_pickle_and_deepcopy():
+    test_spec = Spec('test_spec', _mock_fit_pred, _mock_fit_pred, {'m1':_mock_metric},
+                     [FloatDist('param1', 0.0, 1.0)])
+    test_spec.add_trial({'param1':0.1, 'm1':0.1})
+    test_spec.add_trial({'param1':0.2, 'm1':0.2})
+
+    for restored in (pickle.loads(pickle.dumps(test_spec)), copy.deepcopy(test_spec)):
+        assert restored.trials == [{'param1':0.1, 'm1':0.1}, {'param1':0.2, 'm1':0.2}]
+        assert restored.fit is _mock_fit_pred
+        assert restored.params[0].__dict__ == test_spec.params[0].__dict__
+
+        restored.add_trial({'param1':0.3, 'm1':0.3})
+        assert len(restored.trials) == 3
+
+    assert len(test_spec.trials) == 2
+
+
+def test_add_trial_short_lived_threads():
+    test_spec = Spec('test_spec', _mock_fit_pred, _mock_fit_pred)
+
+    for i in range(50):
+        thread = threading.Thread(target=test_spec.add_trial, args=({'i':i},))
+        thread.start()
+        thread.join()
+
+    assert [trial['i'] for trial in test_spec.trials] == list(range(50))
+    assert test_spec._buffers == []
+
+
+def test_sample_low_acceptance():
+    test_spec = Spec('test_spec', _mock_fit_pred, _mock_fit_pred,
+                     params=[FloatDist('param1', 0.0, 1.0), FloatDist('param2', 0.0, 1.0)])
+
+    # ~0.1% acceptance needs several adaptively sized batches.
+    sample = test_spec.sample(500, constraints=[lambda c: (c['param1'] < 0.01) & (c['param2'] < 0.1)])
+
+    assert all(len(col) == 500 for col in sample.values())
+    assert np.all(sample['param1'] < 0.01) and np.all(sample['param2'] < 0.1)
+
+
+def test_sample_constraints_impossible():
+    test_spec = Spec('test_spec', _mock_fit_pred, _mock_fit_pred,
+                     params=[FloatDist('param1', 0.0, 1.0)])
+
+    with pytest.warns(UserWarning):
+        sample = test_spec.sample(10, constraints=[lambda c: c['param1'] > 2.0], max_attempts=5)
+
+    assert len(sample['param1']) == 0
+
+
+def test_sample_first_batch_capped(monkeypatch):
+    monkeypatch.setattr('modelworks2.spec.MAX_SAMPLE_BATCH', 100)
+    test_spec = Spec('test_spec', _mock_fit_pred, _mock_fit_pred,
+                     params=[FloatDist('param1', 0.0, 1.0)])
+    sizes = []
+    original = FloatDist.sample_array
+    monkeypatch.setattr(FloatDist, 'sample_array', lambda self, n: sizes.append(n) or original(self, n))
+
+    sample = test_spec.sample(1000)
+
+    assert len(sample['param1']) == 1000
+    assert max(sizes) <= 100
+
+
+class ScalarDist(BaseDistribution):
+    # Follows the BaseDistribution.sample contract of a single value for n == 1.
+    def sample(self, n=1):
+        values = [float(i) for i in range(n)]
+        return values[0] if n == 1 else values
+
+    def sample_unique(self, n):
+        return self.sample(n)
+
+
+def test_sample_custom_dist_single_value():
+    test_spec = Spec('test_spec', _mock_fit_pred, _mock_fit_pred, params=[ScalarDist('param1')])
+
+    assert list(test_spec.sample(1)['param1']) == [0.0]
+    assert [len(c['param1']) for c in test_spec.iter_samples(11, chunk=5)] == [5, 5, 1]
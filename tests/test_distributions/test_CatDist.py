@@ -30,4 +30,24 @@ def test_sample_unique():
 
     sample = test_dist.sample_unique(len(OPTIONS)+1)
     assert len(sample) == len(OPTIONS)
-    assert len(set(sample)) == len(OPTIONS)
\ No newline at end of file
+    assert len(set(sample)) == len(OPTIONS)
+
+def test_iter_samples():
+    chunks = list(test_dist.iter_samples(25, chunk=10))
+    assert [len(c) for c in chunks] == [10, 10, 5]
+    assert all(e in OPTIONS for c in chunks for e in c)
+
+
+def test_iter_samples_unique():
+    chunks = list(test_dist.iter_samples(len(OPTIONS), chunk=3, unique=True))
+    assert [len(c) for c in chunks] == [3, 3, 2]
+    sample = [e for c in chunks for e in c]
+    assert len(set(sample)) == len(OPTIONS)
+
+
+def test_sample_array_dtype():
+    assert test_dist.sample_array(5).dtype == object
+    assert CatDist('ints', [1, 2, 3]).sample_array(5).dtype.kind == 'i'
+    assert CatDist('strs', ['a', 'b']).sample_array(5).dtype.kind == 'U'
+    assert CatDist('mixed', ['a', 1]).sample_array(5).dtype == object
+    assert all(e in ['a', 1] for e in CatDist('mixed', ['a', 1]).sample_array(20))
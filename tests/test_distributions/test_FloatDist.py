@@ -1,5 +1,6 @@
 import numpy as np
 import decimal
+import pytest
 
 from modelworks2.distributions import FloatDist
 
@@ -76,4 +77,61 @@ def test_log_unique_sample_with_step():
     assert np.round(min(samples), STANDARD_LOG_MIN_PRECISION) >= STANDARD_LOG_MIN
     assert np.round(max(samples), STANDARD_MAX_PRECISION) <= STANDARD_MAX
     assert len(samples) == len(np.unique(samples))
-    assert np.round(min(np.diff(sorted(np.unique(samples)))), STANDARD_STEP_PRECISION) >= STANDARD_STEP
\ No newline at end of file
+    assert np.round(min(np.diff(sorted(np.unique(samples)))), STANDARD_STEP_PRECISION) >= STANDARD_STEP
+
+def test_iter_samples():
+    test_dist = FloatDist('test', STANDARD_MIN, STANDARD_MAX)
+    chunks = list(test_dist.iter_samples(STANDARD_SAMPLE_SIZE, chunk=20))
+    assert [len(c) for c in chunks] == [20, 20, 10]
+    samples = np.concatenate(chunks)
+    assert np.round(min(samples), STANDARD_MIN_PRECISION) >= STANDARD_MIN
+    assert np.round(max(samples), STANDARD_MAX_PRECISION) <= STANDARD_MAX
+
+
+def test_iter_samples_unique_no_step():
+    test_dist = FloatDist('test', STANDARD_MIN, STANDARD_MAX)
+    samples = np.concatenate(list(test_dist.iter_samples(STANDARD_SAMPLE_SIZE, chunk=7, unique=True)))
+    assert len(samples) == STANDARD_SAMPLE_SIZE
+    assert len(samples) == len(np.unique(samples))
+
+
+def test_iter_samples_unique_with_step():
+    test_dist = FloatDist('test', STANDARD_MIN, STANDARD_MAX, step=STANDARD_STEP)
+    samples = np.concatenate(list(test_dist.iter_samples(STANDARD_SAMPLE_SIZE, chunk=7, unique=True)))
+    assert len(samples) == STANDARD_SAMPLE_SIZE
+    assert len(samples) == len(np.unique(samples))
+    assert np.round(min(np.diff(sorted(samples))), STANDARD_STEP_PRECISION) >= STANDARD_STEP
+
+
+def test_iter_samples_unique_sparse_step():
+    # Far more steps than samples, so seen values are tracked sparsely.
+    test_dist = FloatDist('test', 0.0, 1.0, step=1e-9)
+    samples = np.concatenate(list(test_dist.iter_samples(STANDARD_SAMPLE_SIZE, chunk=7, unique=True)))
+    assert len(samples) == STANDARD_SAMPLE_SIZE
+    assert len(samples) == len(np.unique(samples))
+
+
+def test_iter_samples_unique_exhausts_steps():
+    test_dist = FloatDist('test', 0.0, 99.5, step=1.0)
+    samples = np.concatenate(list(test_dist.iter_samples(100, chunk=9, unique=True)))
+    assert sorted(samples) == list(np.arange(100.0))
+
+
+def test_iter_samples_unique_int_bounds_are_float():
+    test_dist = FloatDist('test', 0, 10, step=1)
+    for chunk in test_dist.iter_samples(5, unique=True):
+        assert chunk.dtype == np.float64
+
+
+def test_grid_values_endpoints():
+    assert np.allclose(FloatDist('test', 0.0, 0.3, step=0.1).grid_values(), [0.0, 0.1, 0.2, 0.3])
+    assert np.allclose(FloatDist('test', 0.0, 1.0, step=0.1).grid_values(), np.arange(11) / 10)
+    assert np.allclose(FloatDist('test', 0.0, 1.0, step=0.25).grid_values(), [0.0, 0.25, 0.5, 0.75, 1.0])
+    assert np.allclose(FloatDist('test', 0.0, 1.1, step=0.25).grid_values(), [0.0, 0.25, 0.5, 0.75, 1.0])
+
+
+def test_iter_samples_unique_excludes_max_val():
+    test_dist = FloatDist('test', 0, 4, step=1)
+    with pytest.warns(UserWarning, match="impossible"):
+        samples = np.concatenate(list(test_dist.iter_samples(5, unique=True)))
+    assert sorted(samples) == [0.0, 1.0, 2.0, 3.0]
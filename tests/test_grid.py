@@ -0,0 +1,89 @@
+import itertools
+import numpy as np
+import pytest
+
+from modelworks2.distributions import BaseDistribution, FloatDist, CatDist
+from modelworks2.grid import GridSpace
+from modelworks2.spec import Spec
+
+
+PARAMS = [FloatDist('lr', 0.0, 1.0, step=0.25),
+          CatDist('kernel', ['linear', 'rbf', 'poly']),
+          FloatDist('depth', 1.0, 4.0, step=1.0)]
+
+PRODUCT = list(itertools.product([0.0, 0.25, 0.5, 0.75, 1.0], ['linear', 'rbf', 'poly'], [1.0, 2.0, 3.0, 4.0]))
+
+
+def _rows(chunks):
+    return [(lr, kernel, depth) for c in chunks for lr, kernel, depth in zip(c['lr'], c['kernel'], c['depth'])]
+
+
+def test_config_and_index():
+    grid = GridSpace(PARAMS)
+    assert len(grid) == len(PRODUCT)
+
+    for i, (lr, kernel, depth) in enumerate(PRODUCT):
+        config = grid.config(i)
+        assert config == {'lr':lr, 'kernel':kernel, 'depth':depth}
+        assert grid.index(config) == i
+
+    with pytest.raises(ValueError):
+        grid.index({'lr':0.3, 'kernel':'rbf', 'depth':1.0})
+
+
+def test_index_large_values():
+    grid = GridSpace([FloatDist('x', 1e6, 1e6 + 10, step=1.0)])
+    assert grid.index({'x':1e6 + 3.0}) == 3
+
+    with pytest.raises(ValueError):
+        grid.index({'x':1e6 + 0.4})
+
+
+def test_iter_configs():
+    grid = GridSpace(PARAMS)
+    chunks = list(grid.iter_configs(chunk=7))
+    assert all(len(c['lr']) <= 7 for c in chunks)
+    assert _rows(chunks) == PRODUCT
+
+
+def test_iter_configs_bad_range():
+    grid = GridSpace(PARAMS)
+    for start, stop in [(-2, None), (5, 3), (0, len(grid) + 1)]:
+        with pytest.raises(IndexError):
+            list(grid.iter_configs(start, stop))
+
+
+def test_shard():
+    grid = GridSpace(PARAMS)
+    shards = [grid.shard(w, 4) for w in range(4)]
+    assert shards[0][0] == 0 and shards[-1][1] == len(grid)
+    assert all(a[1] == b[0] for a, b in zip(shards, shards[1:]))
+    assert _rows(c for s in shards for c in grid.iter_configs(*s)) == PRODUCT
+
+
+def test_skip_done_trials():
+    test_spec = Spec('test_spec', params=PARAMS)
+    test_spec.add_trial({'lr':0.25, 'kernel':'rbf', 'depth':2.0, 'm1':0.5})
+    test_spec.add_trial({'lr':0.3, 'kernel':'rbf', 'depth':2.0, 'm1':0.5})
+
+    rows = _rows(test_spec.grid().iter_configs())
+    assert rows == [p for p in PRODUCT if p != (0.25, 'rbf', 2.0)]
+    assert len(_rows(test_spec.grid(skip_trials=False).iter_configs())) == len(PRODUCT)
+
+
+def test_no_step():
+    with pytest.raises(ValueError):
+        GridSpace([FloatDist('lr', 0.0, 1.0)])
+
+
+class ContinuousDist(BaseDistribution):
+    def sample(self, n):
+        return [0.0] * n
+
+    def sample_unique(self, n):
+        return [0.0]
+
+
+def test_unsupported_dist():
+    with pytest.raises(ValueError):
+        GridSpace([CatDist('kernel', ['linear', 'rbf']), ContinuousDist('custom')])